@@ -6,20 +6,118 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from PIL import Image, ImageTk
 import os
+import sys
+import errno
 import shutil
 import re
+import threading
+from enum import IntEnum
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
+try:
+    import tifffile # Optional: enables memory-mapped and reduced-resolution TIFF reads
+except ImportError:
+    tifffile = None
+
+class State(IntEnum):
+    """Which junction the viewer is currently asking the user to mark."""
+    SELECT_DISTAL = 0
+    SELECT_PROXIMAL = 1
 
 # --- Constants ---
 # You can adjust the ROI parameters and names here if needed
+# Add "output": "multipage" to a config to write that ROI as one BigTIFF stack (needs tifffile)
 ROI_1_CONFIG = {"name": "50-100_distal_TF", "base": "distal", "skip": 50, "copy": 50}
 ROI_2_CONFIG = {"name": "450-500_distal_TF", "base": "distal", "skip": 450, "copy": 50}
 ROI_3_CONFIG = {"name": "0-300_proximal_TF", "base": "proximal", "skip": 0, "count": 300}
 ROI_4_CONFIG = {"name": "40-90_proximal_TF", "base": "proximal", "skip": 40,"count": 50}
 
+# Trailing slice number in filenames like "scan_0042.tif", used to sort the series
+_NUM_TIF_RE = re.compile(r'(\d+)\.tiff?$', re.IGNORECASE)
+# " registered" suffix stripped from the input folder name to get the output folder name
+_REGISTERED_SUFFIX_RE = re.compile(r'\sregistered$', re.IGNORECASE)
+
 # Max display size for images in the viewer
 MAX_DISPLAY_WIDTH = 800
 MAX_DISPLAY_HEIGHT = 600
 
+# While dragging the slider, redraw at most once per this many ms (always showing the latest position)
+SLIDER_REDRAW_INTERVAL_MS = 30
+
+# Thumbnail caching: how many slices either side of the current one to decode ahead, and how many to keep
+PREFETCH_RADIUS = 4
+THUMB_CACHE_SIZE = 64
+
+# Shared pool for file copies. Copying is disk-bound and releases the GIL, so more workers than cores helps.
+_COPY_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+
+# Errors meaning "this kernel copy primitive can't handle these files", i.e. try the next one
+_KERNEL_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+# The kernel copy path is Linux-only: elsewhere sendfile needs a socket (and won't take offset=None),
+# and shutil.copy2 already uses the platform's fast path (fcopyfile on macOS, CopyFile2 on Windows)
+_USE_KERNEL_COPY = sys.platform.startswith("linux")
+
+
+def _kernel_copy(src_fd, dst_fd, remaining):
+    """Copies bytes between file descriptors inside the kernel. Returns how many bytes are left to copy. Linux only."""
+    # copy_file_range can reflink on CoW filesystems (XFS, Btrfs); sendfile is a page-cache-to-page-cache copy
+    # (the same primitive shutil.copyfile uses on Linux, so it is the fallback rather than the win)
+    primitives = []
+    if hasattr(os, "copy_file_range"):
+        primitives.append(lambda count: os.copy_file_range(src_fd, dst_fd, count))
+    if hasattr(os, "sendfile"):
+        primitives.append(lambda count: os.sendfile(dst_fd, src_fd, None, count))
+
+    for primitive in primitives:
+        try:
+            while remaining > 0:
+                copied = primitive(remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            return remaining
+        except OSError as e:
+            if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                raise
+    return remaining
+
+
+def _fast_copy(src, dst):
+    """Drop-in replacement for shutil.copy2 that avoids moving file data through userspace when it can."""
+    if not _USE_KERNEL_COPY:
+        shutil.copy2(src, dst)
+        return
+
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            remaining = _kernel_copy(src_fd, dst_fd, os.fstat(src_fd).st_size)
+            if remaining > 0:
+                # Both offsets have advanced past whatever the kernel already copied
+                with open(src_fd, "rb", closefd=False) as fsrc, open(dst_fd, "wb", closefd=False) as fdst:
+                    shutil.copyfileobj(fsrc, fdst)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+
+
+def _copy_if_changed(src, dst):
+    """Copies src to dst unless dst already matches it in size and is at least as new, e.g. from an earlier run."""
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        pass # Usually dst just doesn't exist yet
+    else:
+        if src_stat.st_size == dst_stat.st_size and src_stat.st_mtime <= dst_stat.st_mtime:
+            return
+    _fast_copy(src, dst)
+
 class ROIMarkerApp:
     """
     A GUI application for selecting distal and proximal junctions in a series of tibia microCT images and copying multiple Regions of Interest (ROIs) based on the selection.
@@ -33,9 +131,11 @@ class ROIMarkerApp:
         self.input_folder_path = tk.StringVar()
         self.output_folder_path = tk.StringVar()
         self.image_files = []
+        self._input_dir = "" # Input folder the current image_files were read from
+        self._source_paths = [] # Full paths of image_files, joined once
         self.distal_index = -1
         self.proximal_index = -1
-        self.current_state = "SELECT_DISTAL" # Initial state for the viewer
+        self.current_state = State.SELECT_DISTAL # Initial state for the viewer
         self.distal_slice_info = tk.StringVar(value="Distal TF Junction Slice: Not selected")
         self.proximal_slice_info = tk.StringVar(value="Proximal TF Junction Slice: Not selected")
 
@@ -78,11 +178,18 @@ class ROIMarkerApp:
         self.slider = None
         self.mark_button = None
         self.status_label = None
-        self.photo_image = None # To prevent garbage collection
+        self.photo_image = None # Persistent Tk photo that each slice is pasted into
+        self._pending_after = None # Scheduled slider redraw, if any
+        self._pending_index = 0 # Slice the scheduled redraw should show
+        self.thumb_cache = OrderedDict() # LRU of display-sized PIL thumbnails keyed by source path
+        self._thumb_lock = threading.Lock() # Guards thumb_cache and _prefetching
+        self._prefetching = {} # Source path -> Future for thumbnails being decoded in the background
+        self._decode_pool = ThreadPoolExecutor(max_workers=2)
+        self._processing = False # True while a background ROI copy is running
 
     def _check_paths(self):
-        """Enable start button if both paths are set."""
-        if self.input_folder_path.get() and self.output_folder_path.get():
+        """Enable start button if both paths are set and no copy is running."""
+        if self.input_folder_path.get() and self.output_folder_path.get() and not self._processing:
             self.btn_start.config(state="normal")
         else:
             self.btn_start.config(state="disabled")
@@ -103,26 +210,146 @@ class ROIMarkerApp:
 
     def start_processing(self):
         """Validates paths and opens the image viewer."""
+        if self._processing:
+            # The background copy still reads the current series and owns the viewer
+            return
         input_path = self.input_folder_path.get()
         try:
-            files = [f for f in os.listdir(input_path) if f.lower().endswith(('.tif', '.tiff'))]
+            with os.scandir(input_path) as entries:
+                files = [e.name for e in entries if e.is_file() and e.name.lower().endswith(('.tif', '.tiff'))]
             
-            def sort_key(filename):
-                match = re.search(r'(\d+)\.tif', filename, re.IGNORECASE)
-                return int(match.group(1)) if match else 0
-            
-            files.sort(key=sort_key)
+            files.sort(key=lambda fn, _search=_NUM_TIF_RE.search: int(m.group(1)) if (m := _search(fn)) else 0)
 
             if not files:
                 messagebox.showerror("Error", "No TIFF images found in the selected folder.")
                 return
 
             self.image_files = files
+            self._input_dir = input_path
+            # Joining with "" adds exactly one trailing separator, so plain concatenation is safe below
+            src_prefix = os.path.join(input_path, "")
+            self._source_paths = [src_prefix + f for f in files]
             self.open_image_viewer()
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to read folder: {e}")
 
+    def _read_tiff_level(self, filepath):
+        """Returns the smallest pyramid level of a TIFF that still covers the display size, or None if there is none."""
+        with tifffile.TiffFile(filepath) as tif:
+            levels = tif.series[0].levels
+            if len(levels) < 2:
+                return None
+            # Levels are ordered largest first, so walk them from the smallest up
+            for level in reversed(levels):
+                page = level.keyframe
+                if page.imagewidth >= MAX_DISPLAY_WIDTH or page.imagelength >= MAX_DISPLAY_HEIGHT:
+                    return Image.fromarray(level.asarray())
+            return Image.fromarray(levels[0].asarray())
+
+    def _read_memmapped_slice(self, filepath):
+        """Memory-maps an uncompressed slice and samples every n-th pixel, or returns None if it can't be mapped."""
+        try:
+            pixels = tifffile.memmap(filepath, mode='r')
+        except ValueError:
+            # Compressed or non-contiguous TIFFs can't be memory-mapped
+            return None
+        # Only plain (H, W) or interleaved 8-bit (H, W, RGB[A]) slices map straight onto a PIL image.
+        # Multipage (N, H, W) and planar (C, H, W) files are left to the PIL path.
+        if not (pixels.ndim == 2 or (pixels.ndim == 3 and pixels.shape[-1] in (3, 4) and pixels.dtype == 'uint8')):
+            return None
+        # Integer-step sampling only pages in the rows we keep; the resize smooths the result afterwards
+        height, width = pixels.shape[:2]
+        step = max(1, min(width // MAX_DISPLAY_WIDTH, height // MAX_DISPLAY_HEIGHT))
+        try:
+            return Image.fromarray(pixels[::step, ::step].copy())
+        except TypeError:
+            # Pixel type PIL has no mode for
+            return None
+
+    def _shrink_to_display(self, img):
+        """Fits an image into the display box, keeping its aspect ratio. Never enlarges."""
+        src_w, src_h = img.size
+        ratio = min(MAX_DISPLAY_WIDTH / src_w, MAX_DISPLAY_HEIGHT / src_h)
+        if ratio >= 1:
+            return img
+        target = (max(1, int(src_w * ratio)), max(1, int(src_h * ratio)))
+        # reducing_gap makes Pillow do a cheap integer box reduce first, so LANCZOS only runs on a small image
+        return img.resize(target, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+    def _to_display_mode(self, img):
+        """Converts a slice to 8-bit grayscale, which is all the viewer needs and a quarter of the bytes of RGBA."""
+        if img.mode == 'L':
+            return img
+        if img.mode.startswith('I;16'):
+            # Keep the top 8 bits of 16-bit data (equivalent to p >> 8) rather than clipping at 255
+            return img.convert('I').point(lambda p: p * (1 / 256)).convert('L')
+        return img.convert('L')
+
+    def _load_thumbnail(self, filepath):
+        """Decodes a single slice and shrinks it to display size. Safe to call from worker threads."""
+        if tifffile is not None:
+            sampled = self._read_memmapped_slice(filepath)
+            if sampled is not None:
+                return self._shrink_to_display(self._to_display_mode(sampled))
+
+        # Ask the decoder to shrink on load so it never produces the full-resolution raster.
+        # If pyvips is installed, pyvips.Image.thumbnail(filepath, MAX_DISPLAY_WIDTH) does the
+        # same for any format and is a drop-in replacement for this whole method.
+        with Image.open(filepath) as img:
+            if img.draft('L', (MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT)) is None and tifffile is not None:
+                # TIFF decoders ignore draft(); fall back to a reduced pyramid level if the file has one
+                reduced = self._read_tiff_level(filepath)
+                if reduced is not None:
+                    img = reduced
+            img = self._shrink_to_display(self._to_display_mode(img))
+            img.load()
+            return img
+
+    def _decode_into_cache(self, filepath):
+        """Loads a thumbnail and stores it in the LRU cache, evicting the least recently used ones."""
+        try:
+            img = self._load_thumbnail(filepath)
+            with self._thumb_lock:
+                self.thumb_cache[filepath] = img
+                self.thumb_cache.move_to_end(filepath)
+                while len(self.thumb_cache) > THUMB_CACHE_SIZE:
+                    self.thumb_cache.popitem(last=False)
+            return img
+        finally:
+            with self._thumb_lock:
+                self._prefetching.pop(filepath, None)
+
+    def _get_thumbnail(self, index):
+        """Returns the thumbnail for a slice, from the cache if possible."""
+        filepath = self._source_paths[index]
+        with self._thumb_lock:
+            img = self.thumb_cache.get(filepath)
+            if img is not None:
+                self.thumb_cache.move_to_end(filepath)
+                return img
+            pending = self._prefetching.get(filepath)
+        # A prefetch that is still queued may sit behind others; take it over and decode it right here
+        if pending is not None and not pending.cancel():
+            # Already being decoded in the background; waiting is cheaper than decoding it twice
+            return pending.result()
+        return self._decode_into_cache(filepath)
+
+    def _prefetch_around(self, index):
+        """Starts background decodes for the slices near index that aren't cached yet."""
+        first = max(0, index - PREFETCH_RADIUS)
+        last = min(len(self._source_paths), index + PREFETCH_RADIUS + 1)
+        window = self._source_paths[first:last]
+        with self._thumb_lock:
+            # Drop queued decodes the slider has moved away from so the backlog can't grow during a drag
+            wanted = set(window)
+            for filepath, future in list(self._prefetching.items()):
+                if filepath not in wanted and future.cancel():
+                    del self._prefetching[filepath]
+            for filepath in window:
+                if filepath not in self.thumb_cache and filepath not in self._prefetching:
+                    self._prefetching[filepath] = self._decode_pool.submit(self._decode_into_cache, filepath)
+
     def open_image_viewer(self):
         """Creates and manages the Toplevel window for image navigation and selection."""
         if self.viewer_window:
@@ -135,26 +362,40 @@ class ROIMarkerApp:
         self.status_label.pack(pady=10)
         self.image_label = ttk.Label(self.viewer_window)
         self.image_label.pack(padx=10, pady=10)
+        self.photo_image = None # Belonged to the previous viewer's label
 
-        self.slider = ttk.Scale(self.viewer_window, from_=0, to=len(self.image_files) - 1, orient="horizontal", command=lambda val: self.update_image_display(int(float(val))))
+        self.slider = ttk.Scale(self.viewer_window, from_=0, to=len(self.image_files) - 1, orient="horizontal", command=self._on_slider_move)
         self.slider.pack(fill="x", expand=True, padx=20, pady=5)
         
         self.mark_button = ttk.Button(self.viewer_window, text="Mark Slice", command=self.mark_slice)
         self.mark_button.pack(pady=10)
         
-        self.current_state = "SELECT_DISTAL"
-        self.update_status_label()
+        self.current_state = State.SELECT_DISTAL
+        self.update_status_label(0)
         self.update_image_display(0)
 
+    def _on_slider_move(self, val):
+        """Throttles slider redraws: a pending redraw just picks up the newest position instead of being pushed back."""
+        self._pending_index = int(float(val))
+        if self._pending_after is None:
+            self._pending_after = self.root.after(SLIDER_REDRAW_INTERVAL_MS, self._run_pending_update)
+
+    def _run_pending_update(self):
+        """Runs the throttled redraw scheduled by _on_slider_move."""
+        self._pending_after = None
+        self.update_image_display(self._pending_index)
+
     def update_image_display(self, index):
-        """Loads and displays the image at the given index."""
+        """Displays the thumbnail at the given index and prefetches its neighbours."""
         try:
-            filepath = os.path.join(self.input_folder_path.get(), self.image_files[index])
-            with Image.open(filepath) as img:
-                img.thumbnail((MAX_DISPLAY_WIDTH, MAX_DISPLAY_HEIGHT), Image.Resampling.LANCZOS)
-                self.photo_image = ImageTk.PhotoImage(img)
-            self.image_label.config(image=self.photo_image)
+            img = self._get_thumbnail(index)
+            if self.photo_image is None or (self.photo_image.width(), self.photo_image.height()) != img.size:
+                # Slices in a series share one size, so this normally happens once per viewer
+                self.photo_image = ImageTk.PhotoImage(img.mode, img.size)
+                self.image_label.config(image=self.photo_image)
+            self.photo_image.paste(img)
             self.update_status_label(index)
+            self._prefetch_around(index)
         except Exception as e:
             self.image_label.config(text=f"Error loading image: {e}")
 
@@ -165,23 +406,25 @@ class ROIMarkerApp:
         
         base_text = f"Slice {index + 1} / {len(self.image_files)}"
         
-        if self.current_state == "SELECT_DISTAL":
+        if self.current_state == State.SELECT_DISTAL:
             self.status_label.config(text=f"Step 3: Select the Distal TF Junction\n{base_text}")
-        elif self.current_state == "SELECT_PROXIMAL":
+        elif self.current_state == State.SELECT_PROXIMAL:
             self.status_label.config(text=f"Step 4: Select the Proximal TF Junction\n{base_text}")
 
     def mark_slice(self):
         """Handles the logic for marking distal and proximal slices."""
+        if self._processing:
+            return
         current_index = int(self.slider.get())
 
-        if self.current_state == "SELECT_DISTAL":
+        if self.current_state == State.SELECT_DISTAL:
             self.distal_index = current_index
             self.distal_slice_info.set(f"Distal TF Junction Slice: {self.distal_index + 1}") # Update main window
             messagebox.showinfo("Marked!", f"Distal TF junction marked at slice {self.distal_index + 1}.")
-            self.current_state = "SELECT_PROXIMAL"
-            self.update_status_label()
+            self.current_state = State.SELECT_PROXIMAL
+            self.update_status_label(current_index)
 
-        elif self.current_state == "SELECT_PROXIMAL":
+        elif self.current_state == State.SELECT_PROXIMAL:
             self.proximal_index = current_index
             if self.proximal_index <= self.distal_index:
                 messagebox.showwarning("Warning", "Proximal junction must be after the distal junction. Please select again.")
@@ -193,11 +436,8 @@ class ROIMarkerApp:
             self.slider.config(state="disabled")
             self.process_all_rois()
 
-    def _copy_roi_files(self, image_folder_name, roi_config):
-        """Helper function to process and copy files for a single ROI."""
-        roi_name = roi_config["name"]
-        start_index, end_index = 0, 0
-        
+    def _compute_roi_range(self, roi_config):
+        """Returns the (start, end) slice indices of an ROI, or None if the region is out of image bounds."""
         # Determine start and end indices based on ROI type
         if roi_config.get("base") == "proximal":
             # Logic for ROI 3: look back from proximal index
@@ -213,45 +453,113 @@ class ROIMarkerApp:
 
         # Check for out-of-bounds
         if start_index >= len(self.image_files) or end_index > len(self.image_files) or start_index < 0:
-            return f"'{roi_name}': Skipped (Region is out of image bounds)."
-
-        # *** NEW: Construct the new directory structure ***
-        # Path: output_folder / ROI_name / image_folder_name
-        base_output_dir = self.output_folder_path.get()
-        final_output_path = os.path.join(base_output_dir, roi_name, image_folder_name)
-        os.makedirs(final_output_path, exist_ok=True)
-        
-        files_to_copy = self.image_files[start_index:end_index]
-        for filename in files_to_copy:
-            source_path = os.path.join(self.input_folder_path.get(), filename)
-            dest_path = os.path.join(final_output_path, filename)
-            shutil.copy2(source_path, dest_path)
-            
-        # Update success message to be more clear
-        return f"'{roi_name}': Copied {len(files_to_copy)} files to folder '{image_folder_name}'"
+            return None
+        return start_index, end_index
+
+    def _copy_roi_files(self, source_paths, dest_dir, stack_name=None):
+        """Copies the given slices into dest_dir, or into a single stack file if stack_name is given. Runs off the main thread, so no Tk calls here."""
+        os.makedirs(dest_dir, exist_ok=True)
+
+        if stack_name is not None:
+            # One large sequential write instead of a file (and inode) per slice
+            with tifffile.TiffWriter(os.path.join(dest_dir, stack_name), bigtiff=True) as tw:
+                for source_path in source_paths:
+                    tw.write(tifffile.imread(source_path), contiguous=True)
+            return
+
+        dst_prefix = os.path.join(dest_dir, "")
+        dest_paths = [dst_prefix + os.path.basename(source_path) for source_path in source_paths]
+        copies = [_COPY_POOL.submit(_copy_if_changed, src, dst) for src, dst in zip(source_paths, dest_paths)]
+        # Let every copy settle before reporting a failure, so a new run can't start while files are still being written
+        wait(copies)
+        for copy in copies:
+            copy.result()
 
     def process_all_rois(self):
-        """Calculates all ROIs, creates directories, and copies the files."""
+        """Works out every ROI's slice range and starts copying them in the background."""
         try:
+            # Read the Tk variables once here; the background thread must not touch Tk
+            base_output_dir = self.output_folder_path.get()
+
             # Get the image folder name (without " registered")
-            parent_folder_name = os.path.basename(self.input_folder_path.get())
-            image_folder_name = re.sub(r'\sregistered$', '', parent_folder_name, flags=re.IGNORECASE)
+            parent_folder_name = os.path.basename(self._input_dir)
+            image_folder_name = _REGISTERED_SUFFIX_RE.sub('', parent_folder_name)
 
-            # Process each defined ROI by passing the image_folder_name to the helper
-            results = []
+            # Validate every ROI up front; skipped ones go straight into the report
             all_roi_configs = [ROI_1_CONFIG, ROI_2_CONFIG, ROI_3_CONFIG, ROI_4_CONFIG]
-            for config in all_roi_configs:
-                results.append(self._copy_roi_files(image_folder_name, config))
+            results = [None] * len(all_roi_configs)
+            roi_jobs = []
+            for i, config in enumerate(all_roi_configs):
+                roi_range = self._compute_roi_range(config)
+                if roi_range is None:
+                    results[i] = f"'{config['name']}': Skipped (Region is out of image bounds)."
+                elif config.get("output") == "multipage" and tifffile is None:
+                    results[i] = f"'{config['name']}': Skipped (Multipage output requires the tifffile package)."
+                else:
+                    roi_jobs.append((i, config, roi_range))
+
+            # Block a second run (or a new viewer) until this one has reported back
+            self._processing = True
+            self.btn_start.config(state="disabled")
+            self._set_status("Processing ROIs...")
+            threading.Thread(
+                target=self._process_all_rois_bg,
+                args=(roi_jobs, results, image_folder_name, base_output_dir),
+                daemon=True
+            ).start()
+        except Exception as e:
+            # e.g. a hand-edited ROI config missing a key; report it the same way as copy failures
+            self._finish_processing(messagebox.showerror, "Error", f"A critical error occurred during file processing: {e}")
+
+    def _process_all_rois_bg(self, roi_jobs, results, image_folder_name, base_output_dir):
+        """Creates the ROI directories and copies the files. Runs on a worker thread."""
+        try:
+            # Process every ROI concurrently; their destination folders never overlap.
+            # The ROI tasks get their own pool so they never starve _COPY_POOL of workers.
+            futures = {}
+            with ThreadPoolExecutor(max_workers=max(1, len(roi_jobs))) as roi_pool:
+                for i, config, (start_index, end_index) in roi_jobs:
+                    roi_name = config["name"]
+                    # Path: output_folder / ROI_name / image_folder_name
+                    dest_dir = os.path.join(base_output_dir, roi_name, image_folder_name)
+                    count = end_index - start_index
+                    if config.get("output") == "multipage":
+                        stack_name = roi_name + ".tif"
+                        message = f"'{roi_name}': Wrote {count} slices to '{stack_name}' in folder '{image_folder_name}'"
+                    else:
+                        stack_name = None
+                        message = f"'{roi_name}': Copied {count} files to folder '{image_folder_name}'"
+                    future = roi_pool.submit(self._copy_roi_files, self._source_paths[start_index:end_index], dest_dir, stack_name)
+                    futures[future] = (i, message)
+
+                for done, future in enumerate(as_completed(futures), start=1):
+                    future.result()
+                    i, message = futures[future]
+                    results[i] = message
+                    self.root.after(0, self._set_status, f"Processing ROIs... {done} / {len(roi_jobs)} done")
             
             # Show final report
             report_message = f"Processing Complete!\n\n" + "\n\n".join(results)
-            messagebox.showinfo("Success!", report_message)
+            self.root.after(0, self._finish_processing, messagebox.showinfo, "Success!", report_message)
 
         except Exception as e:
-            messagebox.showerror("Error", f"A critical error occurred during file processing: {e}")
+            self.root.after(0, self._finish_processing, messagebox.showerror, "Error", f"A critical error occurred during file processing: {e}")
+
+    def _set_status(self, text):
+        """Shows a progress message in the viewer. Must run on the main thread."""
+        # The user may have closed the viewer while the copy is still running
+        if self.status_label and self.status_label.winfo_exists():
+            self.status_label.config(text=text)
+
+    def _finish_processing(self, show_message, title, message):
+        """Reports the processing outcome and closes the viewer. Must run on the main thread."""
+        try:
+            show_message(title, message)
         finally:
             if self.viewer_window:
                 self.viewer_window.destroy()
+            self._processing = False
+            self._check_paths()
 
 
 if __name__ == "__main__":